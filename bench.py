@@ -0,0 +1,393 @@
+"""Benchmarks of yield_from against native ``yield from``.
+
+Usage:
+
+    python bench.py [module]
+
+Imports the implementation from module (by default yieldfrom), times
+each case, and writes one JSON object per line to standard output.
+Native ``yield from`` cases are included when the Python supports it.
+"""
+
+import json
+import sys
+from itertools import count
+from sys import exc_info, version_info
+from timeit import default_timer
+
+try:
+    range = xrange
+except NameError:
+    pass
+
+
+module_name = 'yieldfrom'
+if len(sys.argv) > 1:
+    module_name = sys.argv[1]
+module = __import__(module_name)
+yield_from = module.yield_from
+yield_from_values = module.yield_from_values
+yield_from_stack = module.yield_from_stack
+
+native = version_info >= (3, 3)
+python = '.'.join([str(part) for part in version_info[:3]])
+repeat = 5
+
+
+class _BenchException(Exception):
+    pass
+
+
+def produce(size):
+    for value in range(size):
+        yield value
+
+
+def echo():
+    value = yield
+    while True:
+        value = yield value
+
+
+def catch():
+    while True:
+        try:
+            yield
+        except _BenchException:
+            pass
+
+
+generator_return = 'return'
+if version_info < (3, 3):
+    generator_return = 'raise StopIteration'
+
+exec('''
+def produce_and_return(size):
+    for value in range(size):
+        yield value
+    ''' + generator_return + '''(size)
+''')
+
+
+def delegate(iterable):
+    for value, handle_send, handle_throw in yield_from(iterable):
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not handle_throw(*exc_info()):
+                raise
+        handle_send(sent)
+
+
+def delegate_values(iterable):
+    wrapper = yield_from_values(iterable)
+    for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+
+
+exec('''
+def delegate_and_return(iterable):
+    wrapper = yield_from(iterable)
+    for value, handle_send, handle_throw in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not handle_throw(*exc_info()):
+                raise
+        handle_send(sent)
+    ''' + generator_return + '''(wrapper.result)
+
+
+def delegate_values_and_return(iterable):
+    wrapper = yield_from_values(iterable)
+    for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+    ''' + generator_return + '''(wrapper.result)
+''')
+
+
+def nest(delegate, depth, size):
+    iterator = produce(size)
+    for _ in range(depth):
+        iterator = delegate(iterator)
+    return iterator
+
+
+def nest_stack(depth, size):
+    def level(depth):
+        if depth:
+            yield yield_from(level(depth - 1))
+        else:
+            yield yield_from(produce(size))
+    return yield_from_stack(level(depth - 1))
+
+
+delegates = {
+    'yield_from': delegate,
+    'yield_from_values': delegate_values,
+}
+returning_delegates = {
+    'yield_from': delegate_and_return,
+    'yield_from_values': delegate_values_and_return,
+}
+
+if native:
+    exec('''
+def delegate_native(iterable):
+    yield from iterable
+
+
+def delegate_native_and_return(iterable):
+    return (yield from iterable)
+''')
+    delegates['native'] = delegate_native
+    returning_delegates['native'] = delegate_native_and_return
+
+
+async_delegates = {}
+
+if version_info >= (3, 6) and hasattr(module, 'async_yield_from'):
+    exec('''
+async_yield_from = module.async_yield_from
+
+
+async def async_produce(size):
+    for value in range(size):
+        yield value
+
+
+async def async_delegate(iterable):
+    wrapper = async_yield_from(iterable)
+    async for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except GeneratorExit:
+            await wrapper.aclose()
+            raise
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+
+
+async def async_delegate_naive(iterable):
+    async for value in iterable:
+        yield value
+
+
+async def async_consume(iterable):
+    async for _ in iterable:
+        pass
+''')
+    async_delegates['async_yield_from'] = async_delegate
+    async_delegates['naive'] = async_delegate_naive
+
+
+def async_passthrough(delegate, size):
+    coroutine = async_consume(delegate(async_produce(size)))
+    try:
+        while True:
+            coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+task_delegates = {}
+
+if version_info >= (3, 5):
+    import asyncio
+    from types import coroutine
+
+    def legacy_level(depth, switches):
+        if depth:
+            iterable = legacy_level(depth - 1, switches)
+        else:
+            iterable = legacy_switches(switches)
+        for value, handle_send, handle_throw in yield_from(iterable):
+            sent = None
+            try:
+                sent = yield value
+            except:
+                if not handle_throw(*exc_info()):
+                    raise
+            handle_send(sent)
+
+    def legacy_switches(switches):
+        for _ in range(switches):
+            yield  # Lets the event loop switch tasks, like asyncio.sleep(0).
+
+    task_delegates['yield_from'] = coroutine(legacy_level)
+
+    if version_info >= (3, 6):
+        exec('''
+async def native_level(depth, switches):
+    if depth:
+        await native_level(depth - 1, switches)
+    else:
+        for _ in range(switches):
+            await asyncio.sleep(0)
+''')
+        task_delegates['native'] = native_level
+
+
+def tasks(delegate, size):
+    loop = asyncio.new_event_loop()
+    try:
+        futures = [asyncio.ensure_future(delegate(3, 10), loop=loop)
+                   for _ in range(size)]
+        loop.run_until_complete(asyncio.gather(*futures))
+    finally:
+        loop.close()
+
+
+def passthrough(delegate, size):
+    for _ in delegate(produce(size)):
+        pass
+
+
+def send(delegate, size):
+    generator = delegate(echo())
+    next(generator)
+    for value in range(size):
+        generator.send(value)
+
+
+def throw(delegate, size):
+    generator = delegate(catch())
+    next(generator)
+    for _ in range(size):
+        generator.throw(_BenchException)
+
+
+def short(delegate, size):
+    iterable = [0, 1, 2]
+    for _ in range(size):
+        for _ in delegate(iterable):
+            pass
+
+
+def long(delegate, size):
+    for _ in delegate(list(range(size))):
+        pass
+
+
+def result(delegate, size):
+    for _ in range(size):
+        generator = delegate(produce_and_return(1))
+        try:
+            while True:
+                next(generator)
+        except StopIteration:
+            pass
+
+
+def depth(delegate, depth):
+    for _ in nest(delegate, depth, 100):
+        pass
+
+
+def depth_stack(depth):
+    for _ in nest_stack(depth, 100):
+        pass
+
+
+def measure(function, *arguments):
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        function(*arguments)
+        elapsed = default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def measure_memory(wrapper, iterable, size):
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    iterables = [iterable() for _ in range(size)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        wrappers = [wrapper(iterable) for iterable in iterables]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del wrappers
+    return float(after - before) / size
+
+
+def report(case, variant, size, seconds=None, bytes_per_instance=None):
+    record = {
+        'module': module_name,
+        'python': python,
+        'case': case,
+        'variant': variant,
+        'size': size,
+    }
+    if seconds is not None:
+        record['seconds'] = seconds
+    if bytes_per_instance is not None:
+        record['bytes_per_instance'] = bytes_per_instance
+    sys.stdout.write(json.dumps(record, sort_keys=True) + '\n')
+    sys.stdout.flush()
+
+
+def main():
+    cases = (
+        ('passthrough', passthrough, delegates, 10000),
+        ('send', send, delegates, 10000),
+        ('throw', throw, delegates, 10000),
+        ('short', short, delegates, 3000),
+        ('long', long, delegates, 10000),
+        ('result', result, returning_delegates, 3000),
+        ('async_passthrough', async_passthrough, async_delegates, 10000),
+        ('tasks', tasks, task_delegates, 1000),
+    )
+    for case, function, variants, size in cases:
+        for variant in sorted(variants):
+            report(case, variant, size,
+                   measure(function, variants[variant], size))
+
+    memory_cases = (
+        ('memory', count),
+        ('memory_builtin', list),
+    )
+    for case, iterable in memory_cases:
+        for variant, wrapper in (('yield_from', yield_from),
+                                 ('yield_from_values', yield_from_values)):
+            bytes_per_instance = measure_memory(wrapper, iterable, 1000000)
+            if bytes_per_instance is not None:
+                report(case, variant, 1000000,
+                       bytes_per_instance=bytes_per_instance)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    for size in (1, 10, 100, 1000):
+        for variant in sorted(delegates):
+            report('depth', variant, size,
+                   measure(depth, delegates[variant], size))
+        report('depth', 'yield_from_stack', size, measure(depth_stack, size))
+
+
+if __name__ == '__main__':
+    main()
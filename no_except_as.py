@@ -35,11 +35,42 @@ with
                 raise
         handle_send(sent)
     result = wrapper.result
+
+When the delegating generator is usually just iterated, without
+values being sent or exceptions thrown into it, you can avoid
+building the handles for every value by replacing either with
+
+    wrapper = yield_from_values(...)
+    for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not wrapper.handle_throw(*sys.exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+    result = wrapper.result
+
+Deeply nested or recursive delegation can instead be flattened
+by driving the outermost generator with yield_from_stack, and
+replacing ``result = yield from ...`` in the generators it drives
+with
+
+    result = yield yield_from(...)
 """
 
 
-__version__ = '1.2.1'
-__all__ = ('yield_from',)
+__version__ = '1.3.0'
+__all__ = ('yield_from', 'yield_from_values', 'yield_from_stack')
+
+from sys import exc_info
+from time import time as _clock
+
+try:
+    _BaseException = BaseException
+except NameError:
+    _BaseException = Exception
 
 
 class _OldStyleClass:
@@ -70,10 +101,18 @@ class yield_from(object):
         # Mutates:
         #     self._iterator: Holds the iterator from iter(iterable).
         #     self._next: Prepares to use the iterator's next method
-        #         for the first iteration on the iterator.
-        #     self._default_next: Saves initial self._next tuple for reuse.
-        self._iterator = iter(iterable)
-        self._next = self._default_next = _next, (self._iterator,)
+        #         for the first iteration on the iterator. None
+        #         unless the iterator is an old-style instance, so
+        #         that __next__ does not have to check every time.
+        #         For old-style instances, this is just _next itself
+        #         rather than a tuple with its arguments, so that no
+        #         memory is used per instance.
+        #     self._default_next: Saves initial self._next for reuse.
+        iterator = self._iterator = iter(iterable)
+        if isinstance(iterator, _OldStyleClassInstance):
+            self._next = self._default_next = _next
+        else:
+            self._next = self._default_next = None
 
     def __repr__(self):
         """Represent the yield_from instance as an unambiguous string."""
@@ -115,10 +154,18 @@ class yield_from(object):
         # Mutates:
         #     self._next: Resets to default, in case handle_send
         #         or handle_throw changed it for this iteration.
-        next_, arguments = self._next
-        self._next = self._default_next
+        next_ = self._next
         try:
-            value = next_(*arguments)
+            if next_ is None:
+                iterator = self._iterator
+                value = type(iterator).next(iterator)
+            elif next_ is self._default_next:
+                # Fast path: nothing pending, so skip the unpacking.
+                value = _next(self._iterator)
+            else:
+                self._next = self._default_next
+                function, arguments = next_
+                value = function(*arguments)
         except StopIteration, stop:
             self.result = _yield_from_value(stop)
             raise
@@ -138,8 +185,12 @@ class yield_from(object):
         # Mutates:
         #     self._next: If value is not None, prepares to use the
         #         iterator's send attribute instead of its next
-        #         method in the next iteration of __next__.
+        #         method in the next iteration of __next__, unless an
+        #         error deferred by drain or send_many is pending.
         if value is not None:
+            next_ = self._next
+            if next_ is not self._default_next and next_[0] is _raise:
+                return
             self._next = self._iterator.send, (value,)
 
     def handle_throw(self, type, exception, traceback):
@@ -167,7 +218,8 @@ class yield_from(object):
         #     self._next: If type was not GeneratorExit and the iterator
         #         has a throw attribute, prepares to use that attribute
         #         instead of the iterator's next method in the next
-        #         iteration of __next__.
+        #         iteration of __next__, unless an error deferred
+        #         by drain or send_many is pending.
         iterator = self._iterator
 
         if issubclass(type, GeneratorExit):
@@ -178,6 +230,12 @@ class yield_from(object):
             close()
             return False
 
+        next_ = self._next
+        if next_ is not self._default_next and next_[0] is _raise:
+            # The iterator already raised an error, which has
+            # been deferred by drain or send_many. Raise that.
+            return True
+
         try:
             throw = iterator.throw
         except AttributeError:
@@ -186,44 +244,464 @@ class yield_from(object):
         self._next = throw, (type, exception, traceback)
         return True
 
+    def drain(self, count, timeout=None):
+        """Do up to count iterations of ``yield from`` at once.
+
+        Arguments:
+            count: The maximum number of values to get.
+            timeout: If not None, the number of seconds after which
+                to stop early. Checked before each iteration, so an
+                iteration that is already running is not interrupted.
+
+        Returns:
+            list: The next values from the iterator. There are fewer
+                than count if the iterator was exhausted, in which
+                case self.result is set, or if the timeout was hit,
+                in which case the next call continues where this
+                one stopped.
+
+        Raises:
+            Any: If the iterator raises an error before any value
+                is gotten. If some values were already gotten, they
+                are returned instead, and the error is raised by
+                the next iteration, so that no value is lost.
+
+        Mutates:
+            self.result: Set to the result of the ``yield from`` if
+                the wrapped iterator is exhausted by this call.
+        """
+        # Mutates:
+        #     self._next: Resets to default after the first
+        #         iteration, like __next__ does. If the iterator
+        #         raised an error after some values were gotten,
+        #         prepares to raise it in the next iteration.
+        values = []
+        if count < 1:
+            return values
+        if timeout is not None:
+            if timeout <= 0:
+                return values
+            deadline = _clock() + timeout
+        append = values.append
+        iterator = self._iterator
+        next_ = self._next
+        self._next = self._default_next
+        try:
+            if next_ is not None and next_ is not self._default_next:
+                function, arguments = next_
+                append(function(*arguments))
+            if self._default_next is None:
+                next_method = type(iterator).next
+            else:
+                next_method = _next
+            if timeout is None:
+                while len(values) < count:
+                    append(next_method(iterator))
+            else:
+                while len(values) < count and _clock() < deadline:
+                    append(next_method(iterator))
+        except StopIteration, stop:
+            self.result = _yield_from_value(stop)
+        except Exception:
+            if not values:
+                raise
+            self._next = _raise, exc_info()
+        return values
+
+    def send_many(self, values):
+        """Send each value through a yield, collecting the yielded values.
+
+        This is equivalent to calling handle_send with each value
+        and doing an iteration of ``yield from`` after each call.
+
+        Arguments:
+            values: An iterable of the values to send.
+
+        Returns:
+            list: The value from the iterator for each value sent.
+                This is shorter than values if the iterator was
+                exhausted, and the remaining values are not sent.
+
+        Raises:
+            AttributeError: If a value is not None
+                and the iterator has no send method.
+            Any: If the iterator raises an error.
+
+            Either error is only raised if no value was gotten yet.
+            Otherwise, like with drain, the values gotten so far are
+            returned, and the error is raised by the next iteration.
+
+        Mutates:
+            self.result: Set to the result of the ``yield from`` if
+                the wrapped iterator is exhausted by this call.
+        """
+        # Mutates:
+        #     self._next: Resets to default, like __next__ does.
+        #         If an error was raised after some values were
+        #         gotten, prepares to raise it in the next iteration.
+        results = []
+        append = results.append
+        iterator = self._iterator
+        send = None
+        try:
+            for value in values:
+                next_ = self._next
+                if value is not None and (next_ is self._default_next
+                                          or next_[0] is not _raise):
+                    if send is None:
+                        send = iterator.send
+                    self._next = self._default_next
+                    append(send(value))
+                    continue
+                if next_ is None:
+                    append(type(iterator).next(iterator))
+                elif next_ is self._default_next:
+                    append(_next(iterator))
+                else:
+                    self._next = self._default_next
+                    function, arguments = next_
+                    append(function(*arguments))
+        except StopIteration, stop:
+            self.result = _yield_from_value(stop)
+        except Exception:
+            if not results:
+                raise
+            self._next = _raise, exc_info()
+        return results
+
     def __getstate__(self):
         """Gets the state of this yield_from instance.
 
         Returns:
             A state object that makes it possible to pickle or copy
             this yield_from instance provided that the delegated-to
-            iterator can be pickled or copied.
+            iterator can be pickled or copied. It starts with a
+            format version, and refers to a pending send, throw,
+            or error deferred by drain or send_many by name, so it
+            holds no functions from this module and can be restored
+            by either variant of it. The traceback of a deferred
+            error is not kept, since tracebacks cannot be pickled.
         """
+        iterator = self._iterator
+        next_ = self._next
+        if next_ is self._default_next:
+            pending = None
+        else:
+            function, arguments = next_
+            if function is _raise:
+                function = 'raise'
+                arguments = arguments[:2] + (None,)
+            else:
+                for name in ('send', 'throw'):
+                    if function == getattr(iterator, name, None):
+                        function = name
+                        break
+            pending = function, arguments
         try:
             result = self.result
         except AttributeError:
-            return (self._iterator, self._next, self._default_next)
-        return (self._iterator, self._next, self._default_next, result)
+            if pending is None:
+                return (1, iterator)
+            return (1, iterator, pending)
+        return (1, iterator, pending, result)
 
     def __setstate__(self, state):
         """Sets the state of this yield_from instance.
 
         Arguments:
-            state: A state object such as returned by __getstate__.
+            state: A state object such as returned by __getstate__,
+                including by older versions or the other variant.
 
         Raises:
-            ValueError: If the state tuple is the wrong size.
+            ValueError: If the state tuple is the wrong size,
+                or is in a format version this does not know.
         """
         # Mutates:
         #     self._iterator: Restores from state.
         #     self._next: Restores from state.
-        #     self._default_next: Restores from state.
+        #     self._default_next: Restores like in __init__.
         #     self.result: Restores from state.
+        if not 2 <= len(state) <= 4:
+            raise ValueError('yield_from state must have 2 to 4 items')
+        if type(state[0]) is not int:
+            # Pickled by version 1.2.1 or earlier:
+            if len(state) > 3:
+                (self._iterator, self._next,
+                 self._default_next, self.result) = state
+                return
+            self._iterator, self._next, self._default_next = state
+            try:
+                del self.result
+            except AttributeError:
+                pass
+            return
+        if state[0] != 1:
+            raise ValueError('unknown yield_from state version')
+        iterator = self._iterator = state[1]
+        if isinstance(iterator, _OldStyleClassInstance):
+            self._next = self._default_next = _next
+        else:
+            self._next = self._default_next = None
+        if len(state) > 2 and state[2] is not None:
+            function, arguments = state[2]
+            if function == 'raise':
+                function = _raise
+            elif function == 'send' or function == 'throw':
+                function = getattr(iterator, function)
+            self._next = function, arguments
         if len(state) > 3:
-            self._iterator, self._next, self._default_next, self.result = state
+            self.result = state[3]
             return
-        self._iterator, self._next, self._default_next = state
         try:
             del self.result
         except AttributeError:
             pass
 
 
+class yield_from_values(yield_from):
+    """Variant of yield_from that iterates over just the values.
+
+    The handle_send and handle_throw methods are called on the
+    instance itself instead of being returned with each value.
+    """
+
+    __slots__ = ()
+
+    def __next__(self):
+        """Do the next iteration of ``yield from`` on the wrapped iterator.
+
+        Returns:
+            Any: The next value from the iterator.
+
+        Raises:
+            StopIteration: If the iterator is exhausted.
+            Any: If the iterator raises an error.
+
+        Mutates:
+            self.result: Set to the result of the ``yield from`` if
+                the wrapped iterator is exhausted by this iteration.
+        """
+        # Mutates:
+        #     self._next: Resets to default, in case handle_send
+        #         or handle_throw changed it for this iteration.
+        next_ = self._next
+        try:
+            if next_ is None:
+                iterator = self._iterator
+                value = type(iterator).next(iterator)
+            elif next_ is self._default_next:
+                value = _next(self._iterator)
+            else:
+                self._next = self._default_next
+                function, arguments = next_
+                value = function(*arguments)
+        except StopIteration, stop:
+            self.result = _yield_from_value(stop)
+            raise
+        return value
+
+    next = __next__  # Python 2 used ``next`` instead of ``__next__``.
+
+
+class yield_from_stack(object):
+    """Generator-like driver that flattens nested delegation.
+
+    Generators driven by this delegate to another iterable with
+
+        result = yield yield_from(...)
+
+    instead of wrapping a ``yield_from`` loop around every level.
+    The delegated-to iterator is pushed onto one explicit stack,
+    so each value costs the same no matter how deep the nesting
+    is, and the depth is not limited by the recursion limit.
+    """
+
+    __slots__ = ('_stack', '_started')
+
+    def __init__(self, iterable):
+        """Initialize the yield_from_stack instance.
+
+        Arguments:
+            iterable: The outermost iterable to drive.
+        """
+        # Mutates:
+        #     self._stack: Holds a yield_from_values instance
+        #         for each level of delegation, innermost last.
+        #     self._started: Whether the outermost iterator has
+        #         been resumed yet, since until then only None
+        #         can be sent, like with a generator.
+        self._stack = [yield_from_values(iterable)]
+        self._started = False
+
+    def __repr__(self):
+        """Represent the yield_from_stack instance as an unambiguous string."""
+        return '<' + type(self).__name__ + ' ' + repr(self._stack) + '>'
+
+    def __iter__(self):
+        """Return the yield_from_stack instance, which is itself an iterator."""
+        return self
+
+    def __next__(self):
+        """Resume the innermost delegation.
+
+        Returns:
+            Any: The next value from the innermost iterator.
+
+        Raises:
+            StopIteration: If the outermost iterator is exhausted.
+                Carries the result of the outermost iterator.
+            Any: If an error propagates out of the outermost iterator.
+        """
+        return self._run()
+
+    next = __next__  # Python 2 used ``next`` instead of ``__next__``.
+
+    def send(self, value):
+        """Send a value into the innermost delegation.
+
+        Arguments:
+            value: The value to send.
+
+        Returns:
+            Any: The next value from the innermost iterator.
+
+        Raises:
+            TypeError: If value is not None and the
+                yield_from_stack instance was just started.
+            StopIteration: If the outermost iterator is exhausted.
+            Any: If an error propagates out of the outermost iterator.
+        """
+        # Mutates:
+        #     self._stack: Pops the innermost level if it cannot
+        #         take the value, to raise the error in its parent.
+        if value is not None and not self._started:
+            raise TypeError("can't send non-None value to a "
+                            "just-started yield_from_stack")
+        stack = self._stack
+        if stack:
+            try:
+                stack[-1].handle_send(value)
+            except:
+                del stack[-1]
+                if not stack:
+                    raise
+                self._unwind(*exc_info())
+        return self._run()
+
+    def throw(self, type, exception=None, traceback=None):
+        """Throw an exception into the innermost delegation.
+
+        Arguments:
+            type: The type of the exception to throw,
+                or the exception itself, like with generators.
+            exception: The exception to throw.
+            traceback: The traceback of the exception to throw.
+
+        Returns:
+            Any: The next value from the innermost iterator,
+                if the exception was handled.
+
+        Raises:
+            TypeError: If type is an exception and exception is not None.
+            StopIteration: If the outermost iterator is exhausted.
+            Any: If an error propagates out of the outermost iterator.
+        """
+        if isinstance(type, _BaseException):
+            if exception is not None:
+                raise TypeError('instance exception may not '
+                                'have a separate value')
+            exception = type
+            type = exception.__class__
+        self._unwind(type, exception, traceback)
+        return self._run()
+
+    def close(self):
+        """Close every level of delegation, innermost first.
+
+        Raises:
+            RuntimeError: If an iterator yields a value
+                instead of exiting on GeneratorExit.
+            Any: If an error propagates out of the outermost iterator.
+        """
+        try:
+            self.throw(GeneratorExit)
+        except (GeneratorExit, StopIteration):
+            return
+        raise RuntimeError('generator ignored GeneratorExit')
+
+    def _run(self):
+        # Mutates:
+        #     self._stack: Pushes delegations as they are yielded
+        #         and pops them as they finish or raise.
+        #     self._started: Set to True.
+        self._started = True
+        stack = self._stack
+        while stack:
+            level = stack[-1]
+            try:
+                value = level.next()
+            except StopIteration:
+                del stack[-1]
+                if not stack:
+                    raise
+                stack[-1].handle_send(level.result)
+                continue
+            except:
+                del stack[-1]
+                if not stack:
+                    raise
+                self._unwind(*exc_info())
+                continue
+            if isinstance(value, yield_from):
+                stack.append(yield_from_values(value._iterator))
+                continue
+            return value
+        raise StopIteration
+
+    def _unwind(self, type, exception, traceback):
+        # Mutates:
+        #     self._stack: Pops every level that cannot
+        #         take the exception, innermost first.
+        stack = self._stack
+        while stack:
+            try:
+                if stack[-1].handle_throw(type, exception, traceback):
+                    return
+            except:
+                type, exception, traceback = exc_info()
+            del stack[-1]
+        if exception is None:
+            raise type
+        raise exception
+
+    def __getstate__(self):
+        """Gets the state of this yield_from_stack instance.
+
+        Returns:
+            A state object that makes it possible to pickle or copy
+            this yield_from_stack instance provided that every
+            delegated-to iterator can be pickled or copied.
+        """
+        return (list(self._stack), self._started)
+
+    def __setstate__(self, state):
+        """Sets the state of this yield_from_stack instance.
+
+        Arguments:
+            state: A state object such as returned by __getstate__.
+
+        Raises:
+            ValueError: If the state tuple is the wrong size.
+        """
+        # Mutates:
+        #     self._stack: Restores from state.
+        #     self._started: Restores from state.
+        if len(state) != 2:
+            raise ValueError('yield_from_stack state must have 2 items')
+        self._stack = list(state[0])
+        self._started = state[1]
+
+
 def _yield_from_value(exception):
     """Get the ``yield from`` return value from a StopIteration instance.
 
@@ -245,8 +723,21 @@ def _yield_from_value(exception):
             return None
 
 
+def _raise(type, exception, traceback):
+    """Raise an error deferred by drain or send_many."""
+    raise type, exception, traceback
+
+
 # Portability to some minimal Python implementations:
 try:
     yield_from.__name__
 except AttributeError:
     yield_from.__name__ = 'yield_from'
+try:
+    yield_from_values.__name__
+except AttributeError:
+    yield_from_values.__name__ = 'yield_from_values'
+try:
+    yield_from_stack.__name__
+except AttributeError:
+    yield_from_stack.__name__ = 'yield_from_stack'
@@ -1,8 +1,8 @@
-from copy import copy
+from copy import copy, deepcopy
 from itertools import count
-from sys import exc_info, version_info
+from sys import exc_info, getrecursionlimit, version_info
 
-from yieldfrom import yield_from
+from yieldfrom import yield_from, yield_from_values, yield_from_stack
 
 
 class _TestException(Exception):
@@ -34,6 +34,31 @@ def delegating_generator(state=None):
         handle_send(sent)
 
 
+def delegating_values_generator(state=None):
+    wrapper = yield_from_values(generator(state))
+    for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+
+
+def stacked_generator(state=None):
+    yield yield_from(generator(state))
+
+
+def stacking_generator(state=None):
+    yield yield_from(stacked_generator(state))
+
+
+def flattened_generator(state=None):
+    return yield_from_stack(stacking_generator(state))
+
+
 def test_yield():
     assert list(generator()) == list(delegating_generator())
 
@@ -103,9 +128,32 @@ def delegating_returning_generator():
             if not t(*exc_info()):
                 raise
     '''+generator_return+'''(wrapper.result)
+
+
+def delegating_returning_values_generator():
+    wrapper = yield_from_values(returning_generator())
+    for v in wrapper:
+        s = None
+        try:
+            s = yield v
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if s is not None:
+            wrapper.handle_send(s)
+    '''+generator_return+'''(wrapper.result)
+
+
+def stacked_returning_generator():
+    result = yield yield_from(returning_generator())
+    '''+generator_return+'''(result + 1)
 ''')
 
 
+def flattened_returning_generator():
+    return yield_from_stack(stacked_returning_generator())
+
+
 def test_return():
     generator_instance = delegating_returning_generator()
     assert next(generator_instance) == 1
@@ -117,6 +165,264 @@ def test_return():
         assert stop.args[0] == 123
 
 
+def check_delegation(delegating):
+    class State(object):
+        def __init__(self):
+            self.exiting = False
+    assert list(generator()) == list(delegating())
+    generator_instance = delegating()
+    assert next(generator_instance) == 1
+    assert next(generator_instance) == 2
+    assert next(generator_instance) == 3
+    assert next(generator_instance) == 4
+    assert generator_instance.send(0) == 0
+    generator_instance = delegating()
+    assert next(generator_instance) == 1
+    assert next(generator_instance) == 2
+    assert generator_instance.throw(_TestException, None, None) == -1
+    exception = _TestException('hi')
+    try:
+        generator_instance.throw(type(exception), exception, None)
+    except _TestException as error:
+        assert error is exception
+    try:
+        next(generator_instance)
+        assert False, 'next() after uncaught throw should have raised'
+    except StopIteration:
+        pass
+    state = State()
+    generator_instance = delegating(state)
+    assert next(generator_instance) == 1
+    assert next(generator_instance) == 2
+    assert next(generator_instance) == 3
+    generator_instance.close()
+    assert state.exiting
+    try:
+        next(generator_instance)
+        assert False, 'next() after un-suppressed close should have raised'
+    except StopIteration:
+        pass
+
+
+def check_return(delegating, result):
+    generator_instance = delegating()
+    assert next(generator_instance) == 1
+    assert next(generator_instance) == 2
+    assert next(generator_instance) == 3
+    try:
+        next(generator_instance)
+    except StopIteration as stop:
+        assert stop.args[0] == result
+
+
+def test_values():
+    check_delegation(delegating_values_generator)
+    check_return(delegating_returning_values_generator, 123)
+
+
+def test_stack():
+    check_delegation(flattened_generator)
+    check_return(flattened_returning_generator, 124)
+
+
+if version_info >= (3, 6):
+    exec('''
+from yieldfrom import async_yield_from
+
+
+async def async_generator(state=None):
+    yield 1
+    try:
+        yield 2
+    except _TestException:
+        yield -1
+    try:
+        yield 3
+    except GeneratorExit:
+        state.exiting = True
+        raise
+    yield (yield 4)
+
+
+async def delegating_async_generator(state=None):
+    wrapper = async_yield_from(async_generator(state))
+    async for value in wrapper:
+        sent = None
+        try:
+            sent = yield value
+        except GeneratorExit:
+            await wrapper.aclose()
+            raise
+        except:
+            if not wrapper.handle_throw(*exc_info()):
+                raise
+        if sent is not None:
+            wrapper.handle_send(sent)
+''')
+
+
+def run(awaitable):
+    iterator = awaitable.__await__()
+    while True:
+        try:
+            next(iterator)
+        except StopIteration as stop:
+            return stop.value
+
+
+def test_async():
+    if version_info < (3, 6):
+        return
+    generator_instance = delegating_async_generator()
+    assert run(generator_instance.__anext__()) == 1
+    assert run(generator_instance.__anext__()) == 2
+    assert run(generator_instance.__anext__()) == 3
+    assert run(generator_instance.__anext__()) == 4
+    assert run(generator_instance.asend(0)) == 0
+    try:
+        run(generator_instance.__anext__())
+        assert False, '__anext__() after exhaustion should have raised'
+    except StopAsyncIteration:
+        pass
+
+    generator_instance = delegating_async_generator()
+    assert run(generator_instance.__anext__()) == 1
+    assert run(generator_instance.__anext__()) == 2
+    assert run(generator_instance.athrow(_TestException)) == -1
+    try:
+        run(generator_instance.athrow(_TestException))
+        assert False, 'athrow() should have raised'
+    except _TestException:
+        pass
+
+    class State(object):
+        def __init__(self):
+            self.exiting = False
+    state = State()
+    generator_instance = delegating_async_generator(state)
+    assert run(generator_instance.__anext__()) == 1
+    assert run(generator_instance.__anext__()) == 2
+    assert run(generator_instance.__anext__()) == 3
+    run(generator_instance.aclose())
+    assert state.exiting
+
+
+def test_asyncio():
+    if version_info < (3, 5):
+        return
+    import asyncio
+    from types import coroutine
+
+    state = []
+
+    def wait(future):
+        wrapper = yield_from(future)
+        for value, handle_send, handle_throw in wrapper:
+            sent = None
+            try:
+                sent = yield value
+            except:
+                if not handle_throw(*exc_info()):
+                    raise
+            handle_send(sent)
+        state.append(wrapper.result)
+
+    @coroutine
+    def task(loop):
+        done = loop.create_future()
+        loop.call_soon(done.set_result, 'done')
+        for value, handle_send, handle_throw in yield_from(wait(done)):
+            sent = None
+            try:
+                sent = yield value
+            except:
+                if not handle_throw(*exc_info()):
+                    raise
+            handle_send(sent)
+        try:
+            never = loop.create_future()
+            for value, handle_send, handle_throw in yield_from(wait(never)):
+                sent = None
+                try:
+                    sent = yield value
+                except:
+                    if not handle_throw(*exc_info()):
+                        raise
+                handle_send(sent)
+        except asyncio.CancelledError:
+            state.append('cancelled')
+            raise
+
+    loop = asyncio.new_event_loop()
+    try:
+        future = asyncio.ensure_future(task(loop), loop=loop)
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.run_until_complete(asyncio.sleep(0))
+        assert state == ['done']
+        future.cancel()
+        try:
+            loop.run_until_complete(future)
+            assert False, 'cancelled task should have raised'
+        except asyncio.CancelledError:
+            pass
+        assert state == ['done', 'cancelled']
+    finally:
+        loop.close()
+
+
+def test_stack_depth():
+    def nested(depth):
+        if depth:
+            yield yield_from(nested(depth - 1))
+        else:
+            yield 'bottom'
+    depth = getrecursionlimit() * 2
+    assert list(yield_from_stack(nested(depth))) == ['bottom']
+
+
+def test_stack_unwind():
+    def raising():
+        raise _TestException('boom')
+        yield
+    def catching():
+        try:
+            yield yield_from(raising())
+        except _TestException:
+            yield 'caught'
+    def nested():
+        yield yield_from(catching())
+    assert list(yield_from_stack(nested())) == ['caught']
+
+
+def test_stack_throw_instance():
+    def catching():
+        try:
+            yield 'waiting'
+        except _TestException:
+            yield 'caught'
+    def nested():
+        yield yield_from(catching())
+    stack = yield_from_stack(nested())
+    assert next(stack) == 'waiting'
+    assert stack.throw(_TestException('boom')) == 'caught'
+
+
+def test_stack_send_error():
+    def catching():
+        try:
+            yield yield_from([1, 2])
+        except AttributeError:
+            yield 'caught'
+    stack = yield_from_stack(catching())
+    try:
+        stack.send('sent')
+        assert False, 'send() should have raised TypeError'
+    except TypeError:
+        pass
+    assert next(stack) == 1
+    assert stack.send('sent') == 'caught'
+
+
 def test_no_result_until_done():
     instance = yield_from(range(1))
     try:
@@ -136,6 +442,167 @@ def test_no_result_until_done():
         assert instance.result is None
 
 
+def test_result_of_builtin_iterator():
+    euro = b'\xe2\x82\xac'.decode('utf-8')
+    for iterable in ([1], (1,), '1', euro, {1: 1}, set([1]), range(1)):
+        for wrapper_type in (yield_from, yield_from_values):
+            instance = wrapper_type(iterable)
+            next(instance)
+            try:
+                next(instance)
+                assert False, 'next() should have raised StopIteration'
+            except StopIteration:
+                pass
+            assert instance.result is None
+            try:
+                next(instance)
+                assert False, 'next() should have raised StopIteration'
+            except StopIteration:
+                pass
+
+
+def test_result_of_custom_iterator():
+    class I(object):
+        def __iter__(self):
+            return self
+        def __next__(self):
+            raise StopIteration('boom')
+        next = __next__  # for Python 2
+    for wrapper_type in (yield_from, yield_from_values):
+        instance = wrapper_type(I())
+        try:
+            next(instance)
+            assert False, 'next() should have raised StopIteration'
+        except StopIteration:
+            pass
+        assert instance.result == 'boom'
+
+
+def test_old_style_iterator():
+    class I:
+        def __init__(self):
+            self.values = [1, 2]
+        def __iter__(self):
+            return self
+        def __next__(self):
+            if not self.values:
+                raise StopIteration
+            return self.values.pop(0)
+        next = __next__  # for Python 2
+    instance = yield_from(I())
+    assert [value for value, _, _ in instance] == [1, 2]
+    assert instance.result is None
+
+
+def test_drain():
+    instance = yield_from(generator())
+    assert instance.drain(0) == []
+    assert instance.drain(2) == [1, 2]
+    instance.handle_throw(_TestException, None, None)
+    assert instance.drain(1) == [-1]
+    assert instance.drain(10) == [3, 4, None]
+    assert instance.result is None
+    instance = yield_from(range(3))
+    assert instance.drain(10) == [0, 1, 2]
+    assert instance.result is None
+    instance = yield_from(returning_generator())
+    assert instance.drain(10) == [1, 2, 3]
+    assert instance.result == 123
+
+
+def test_drain_timeout():
+    instance = yield_from(count())
+    assert instance.drain(10, timeout=0) == []
+    values = instance.drain(10 ** 9, timeout=0.01)
+    assert 0 < len(values) < 10 ** 9
+    assert values == list(range(len(values)))
+    assert instance.drain(1, timeout=1) == [len(values)]
+    try:
+        instance.result
+        assert False, '.result should not exist yet'
+    except AttributeError:
+        pass
+    instance = yield_from(returning_generator())
+    assert instance.drain(10, timeout=1) == [1, 2, 3]
+    assert instance.result == 123
+
+
+def test_send_many():
+    def echo():
+        value = yield 'ready'
+        while value != 'stop':
+            value = yield value
+    instance = yield_from(echo())
+    assert instance.send_many([None, 1, 2, None]) == ['ready', 1, 2, None]
+    instance.handle_throw(_TestException, None, None)
+    try:
+        instance.send_many([None])
+        assert False, 'send_many() should have raised'
+    except _TestException:
+        pass
+    instance = yield_from(echo())
+    assert instance.send_many([None, 1, 'stop', 2]) == ['ready', 1]
+    assert instance.result is None
+
+
+def test_drain_and_send_many_error():
+    def raising():
+        value = yield 1
+        yield value
+        raise _TestException('boom')
+    instance = yield_from(raising())
+    assert instance.drain(10) == [1, None]
+    try:
+        instance.drain(10)
+        assert False, 'drain() should have raised the deferred error'
+    except _TestException:
+        pass
+    assert instance.drain(10) == []
+    instance = yield_from(raising())
+    assert instance.send_many([None, 2, None]) == [1, 2]
+    try:
+        next(instance)
+        assert False, 'next() should have raised the deferred error'
+    except _TestException:
+        pass
+    instance = yield_from(raising())
+    assert instance.send_many([None, 2, None]) == [1, 2]
+    try:
+        instance.send_many([5])
+        assert False, 'send_many() should have raised the deferred error'
+    except _TestException:
+        pass
+    instance = yield_from(raising())
+    assert instance.send_many([None, 2, None]) == [1, 2]
+    instance.handle_send('sent')
+    try:
+        next(instance)
+        assert False, 'next() should have raised the deferred error'
+    except _TestException:
+        pass
+    instance = yield_from(raising())
+    assert instance.send_many([None, 2, None]) == [1, 2]
+    assert instance.handle_throw(KeyError, None, None)
+    try:
+        next(instance)
+        assert False, 'next() should have raised the deferred error'
+    except _TestException:
+        pass
+    instance = yield_from(raising())
+    assert instance.drain(10) == [1, None]
+    state = instance.__getstate__()
+    assert state[2][0] == 'raise'
+    assert state[2][1][0] is _TestException
+    assert state[2][1][2] is None
+    other = yield_from([])
+    other.__setstate__(state)
+    try:
+        next(other)
+        assert False, 'next() should have raised the restored error'
+    except _TestException:
+        pass
+
+
 def test_repr():
     def g():
         yield
@@ -226,6 +693,86 @@ def test_get_set_state_with_result():
     assert copy(instance).result == instance.result
 
 
+def test_set_state_with_tuple_default():
+    iterator = count()
+    default = (None, (iterator,))  # As pickled by older versions.
+    instance = yield_from([])
+    instance.__setstate__((iterator, default, default))
+    assert next(instance)[0] == 0
+    pending = (lambda value: value, ('sent',))
+    instance.__setstate__((iterator, pending, default))
+    assert next(instance)[0] == 'sent'
+    assert next(instance)[0] == 1
+
+
+def test_state_format():
+    class I(object):
+        def __iter__(self):
+            return self
+        def __next__(self):
+            return 'from next'
+        next = __next__  # for Python 2
+        def send(self, value):
+            return value
+    iterator = I()
+    instance = yield_from(iterator)
+    assert instance.__getstate__() == (1, iterator)
+    instance.handle_send('sent')
+    assert instance.__getstate__() == (1, iterator, ('send', ('sent',)))
+    other = yield_from([])
+    other.__setstate__((1, iterator, ('send', ('restored',))))
+    assert next(other)[0] == 'restored'
+    assert next(other)[0] == 'from next'
+    other.__setstate__((1, iterator, None, 'result'))
+    assert other.result == 'result'
+    other.__setstate__((1, iterator))
+    try:
+        other.result
+        assert False, '.result should not exist after restoring'
+    except AttributeError:
+        pass
+    for state in ((1,), (1, iterator, None, None, None), (2, iterator)):
+        try:
+            other.__setstate__(state)
+            assert False, '__setstate__() should have raised ValueError'
+        except ValueError:
+            pass
+    try:
+        yield_from_stack(iterator).__setstate__(([],))
+        assert False, '__setstate__() should have raised ValueError'
+    except ValueError:
+        pass
+
+
+def test_fork_with_deepcopy():
+    class I(object):
+        def __init__(self):
+            self.count = 0
+        def __iter__(self):
+            return self
+        def __next__(self):
+            self.count += 1
+            return self.count
+        next = __next__  # for Python 2
+        def send(self, value):
+            self.count = value
+            return value
+    instance = yield_from(I())
+    next(instance)
+    instance.handle_send(10)
+    fork = deepcopy(instance)
+    assert next(instance)[0] == 10
+    assert next(instance)[0] == 11
+    assert next(fork)[0] == 10
+    assert next(fork)[0] == 11
+    stack = yield_from_stack(I())
+    next(stack)
+    fork = deepcopy(stack)
+    assert next(stack) == 2
+    assert next(stack) == 3
+    assert next(fork) == 2
+
+
 def test_get_set_state_preserves_send():
     class I(object):
         def __init__(self):
@@ -272,9 +819,27 @@ if __name__ == '__main__':
     test_throw()
     test_close()
     test_return()
+    test_values()
+    test_stack()
+    test_async()
+    test_asyncio()
+    test_stack_depth()
+    test_stack_unwind()
+    test_stack_throw_instance()
+    test_stack_send_error()
     test_no_result_until_done()
+    test_result_of_builtin_iterator()
+    test_result_of_custom_iterator()
+    test_old_style_iterator()
+    test_drain()
+    test_drain_timeout()
+    test_send_many()
+    test_drain_and_send_many_error()
     test_repr()
     test_get_set_state_without_result()
     test_get_set_state_with_result()
+    test_set_state_with_tuple_default()
+    test_state_format()
+    test_fork_with_deepcopy()
     test_get_set_state_preserves_send()
     test_get_set_state_preserves_throw()